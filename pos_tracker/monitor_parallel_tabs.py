@@ -1,20 +1,30 @@
-import os, re, time, atexit, gc
+import os, re, time, atexit, queue, asyncio, weakref, threading
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from typing import List, Tuple, Any, Dict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from dotenv import load_dotenv
-from tenacity import retry, stop_after_attempt, wait_fixed
 
 import gspread
+import requests
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.service_account import Credentials
 
-import undetected_chromedriver as uc
+from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.support import expected_conditions as EC
 
+# Optional async engine (SCRAPER_ENGINE=playwright): one Chromium, one context per job
+try:
+    from playwright.async_api import async_playwright
+    from playwright.async_api import Error as PlaywrightError
+except ImportError:
+    async_playwright = None
+    PlaywrightError = Exception
+
 # ==================== ENV / CONFIG ====================
 load_dotenv()
 
@@ -23,16 +33,20 @@ INPUT_TABS = [t.strip() for t in os.getenv("INPUT_TABS", "").split(",") if t.str
 SA_JSON    = os.getenv("GCP_SA_JSON_PATH", "service_account.json").strip()
 HEADLESS   = os.getenv("HEADLESS", "true").lower() == "true"
 TZ_NAME    = os.getenv("TIMEZONE", "Asia/Kolkata").strip()
-UC_VERSION = os.getenv("UC_VERSION_MAIN", "").strip()
+CHROME_BIN = os.getenv("CHROME_BIN", "").strip()
 
 PAGELOAD_TIMEOUT = int(os.getenv("PAGELOAD_TIMEOUT", "45"))
 AFTER_LOAD_WAIT  = int(os.getenv("AFTER_LOAD_WAIT", "10"))
 BETWEEN_STORES_S = float(os.getenv("BETWEEN_STORES_SECONDS", "1"))
 MAX_WORKERS      = max(1, int(os.getenv("MAX_WORKERS", "5")))
+MAX_USES_PER_INSTANCE = max(1, int(os.getenv("MAX_USES_PER_INSTANCE", "50")))
+SCRAPER_ENGINE   = os.getenv("SCRAPER_ENGINE", "selenium").strip().lower()
+MAX_TAB_WORKERS  = max(1, int(os.getenv("MAX_TAB_WORKERS", "4")))
 
 # ==================== TIMEZONE ====================
 try:
     from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    @lru_cache(maxsize=1)
     def get_tz():
         try:
             return ZoneInfo(TZ_NAME)
@@ -41,37 +55,53 @@ try:
                 return timezone(timedelta(hours=5, minutes=30))
             return datetime.now().astimezone().tzinfo or timezone.utc
 except Exception:
+    @lru_cache(maxsize=1)
     def get_tz():
         return timezone(timedelta(hours=5, minutes=30))
 
-def now_date_str(): return datetime.now(get_tz()).strftime("%Y-%m-%d")
-def now_time_str(): return datetime.now(get_tz()).strftime("%H:%M:%S")
+_TZ = get_tz()  # resolved once at import; ZoneInfo construction parses the tz file
+
+def now_date_str(): return datetime.now(_TZ).strftime("%Y-%m-%d")
+def now_time_str(): return datetime.now(_TZ).strftime("%H:%M:%S")
 
 # ==================== SHEETS HELPERS ====================
-def open_client_and_sheet():
-    scopes = ["https://www.googleapis.com/auth/spreadsheets"]
-    creds = Credentials.from_service_account_file(SA_JSON, scopes=scopes)
-    gc_ = gspread.authorize(creds)
-    sh = gc_.open_by_key(SHEET_ID)
-    return gc_, sh
+# Cached so repeated main() calls (the in-process scheduler) skip re-reading
+# the service-account file and re-doing the OAuth token exchange every cycle.
+_CLIENT = None
+
+def open_client_and_sheet(force_new: bool=False):
+    global _CLIENT
+    if _CLIENT is None or force_new:
+        scopes = ["https://www.googleapis.com/auth/spreadsheets"]
+        creds = Credentials.from_service_account_file(SA_JSON, scopes=scopes)
+        # One keep-alive session for every Sheets call: no TLS/TCP setup per
+        # request, and enough pooled connections for the parallel tab reads.
+        session = AuthorizedSession(creds)
+        session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=20))
+        _CLIENT = gspread.Client(auth=creds, session=session)
+    sh = _CLIENT.open_by_key(SHEET_ID)
+    return _CLIENT, sh
 
 def get_or_all_tabs(sh):
     return INPUT_TABS if INPUT_TABS else [ws.title for ws in sh.worksheets()]
 
 def find_header_row_and_columns(all_values: List[List[str]]):
     """Find row with headers: Brand, Location, Aggregator, Link, Latitude, Longitude (case-insensitive)."""
-    wanted = ["brand", "location", "aggregator", "link", "latitude", "longitude"]
+    wanted = frozenset(["brand", "location", "aggregator", "link", "latitude", "longitude"])
     for i, row in enumerate(all_values, start=1):
-        lowers = [c.strip().lower() for c in row]
-        if all(w in lowers for w in wanted):
-            idx = {name: lowers.index(name) + 1 for name in wanted}  # 1-based
-            return i, idx
+        # One pass per row: header name -> 1-based column, then a set check.
+        mapping = {c.strip().lower(): j + 1 for j, c in enumerate(row) if c.strip()}
+        if wanted <= mapping.keys():
+            return i, {w: mapping[w] for w in wanted}
     raise SystemExit("Header row not found. Expected columns: Brand, Location, Aggregator, Link, Latitude, Longitude")
 
-def first_empty_log_column(ws, start_col: int) -> int:
-    """Find next empty column by checking row 1 and row 2 (both blank means free)."""
-    row1 = ws.row_values(1)
-    row2 = ws.row_values(2)
+def first_empty_log_column(all_vals: List[List[str]], start_col: int) -> int:
+    """Find next empty column by checking row 1 and row 2 (both blank means free).
+
+    Works off the already-fetched values — no extra Sheets API calls.
+    """
+    row1 = all_vals[0] if len(all_vals) > 0 else []
+    row2 = all_vals[1] if len(all_vals) > 1 else []
     def is_empty(col):
         v1 = row1[col-1] if col-1 < len(row1) else ""
         v2 = row2[col-1] if col-1 < len(row2) else ""
@@ -83,8 +113,27 @@ def first_empty_log_column(ws, start_col: int) -> int:
         col += 1
 
 # ==================== BROWSER / SCRAPING ====================
+# The scraper only reads text, so images/fonts/media/analytics are dead weight
+# (typically 60-80% of page bytes) and just delay DOMContentLoaded.
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif", "*.svg",
+    "*.woff", "*.woff2", "*.ttf", "*.mp4",
+    "*googletagmanager*", "*google-analytics*", "*facebook.net*",
+]
+
+# Every driver ever made lands in this WeakSet; one atexit handler quits the
+# stragglers. No per-driver closures, so quit drivers stay collectable.
+_LIVE_DRIVERS = weakref.WeakSet()
+
+def _drain_drivers():
+    for driver in list(_LIVE_DRIVERS):
+        try: driver.quit()
+        except Exception: pass
+
+atexit.register(_drain_drivers)
+
 def make_driver():
-    opts = uc.ChromeOptions()
+    opts = webdriver.ChromeOptions()
     prefs = {
         "profile.default_content_setting_values.geolocation": 1,
         "credentials_enable_service": False,
@@ -96,23 +145,90 @@ def make_driver():
     opts.add_argument("--disable-blink-features=AutomationControlled")
     opts.add_argument("--disable-notifications")
     opts.add_argument("--start-maximized")
+    # Container-friendly flags
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--blink-settings=imagesEnabled=false")
+    opts.page_load_strategy = "eager"
     if HEADLESS:
         opts.add_argument("--headless=new")
+    if CHROME_BIN:
+        opts.binary_location = CHROME_BIN  # the container ships chromium here
 
-    kw = {"options": opts}
-    if UC_VERSION.isdigit():
-        kw["version_main"] = int(UC_VERSION)
-
-    driver = uc.Chrome(**kw)
+    driver = webdriver.Chrome(options=opts)
     driver.set_page_load_timeout(PAGELOAD_TIMEOUT)
+    try:
+        # Minimal stealth: the store pages only sniff navigator.webdriver
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+            "source": "Object.defineProperty(navigator,'webdriver',{get:()=>undefined})"
+        })
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    except WebDriverException:
+        pass  # CDP extras are best-effort; the page still loads without them
+    _LIVE_DRIVERS.add(driver)
+    return driver
 
-    def _safe_quit():
+# Placeholder that keeps a pool slot alive when a dead driver could not be
+# rebuilt (e.g. Chrome refused to start): the next get() retries the build
+# instead of the pool silently shrinking until every worker blocks.
+_NEEDS_DRIVER = object()
+
+class BrowserPool:
+    """Pool of pre-warmed drivers reused across stores (driver startup is ~2-3 s each).
+
+    Drivers are recycled after MAX_USES_PER_INSTANCE uses, or immediately when a
+    worker reports them broken, so a wedged Chrome never circulates forever.
+    The slot count is invariant: if rebuilding a driver fails, a _NEEDS_DRIVER
+    placeholder goes back on the queue and the build is retried on checkout.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self._q = queue.Queue(maxsize=size)
+        self._uses: Dict[int, int] = {}
+        for _ in range(size):
+            self._q.put(make_driver())
+
+    def get(self):
+        item = self._q.get()
+        if item is not _NEEDS_DRIVER:
+            try:
+                item.delete_all_cookies()
+                return item
+            except WebDriverException:
+                self._retire(item)
+        try:
+            return make_driver()
+        except Exception:
+            self._q.put(_NEEDS_DRIVER)  # keep the slot; the caller sees the error
+            raise
+
+    def put_back(self, driver, broken: bool=False):
+        uses = self._uses.get(id(driver), 0) + 1
+        self._uses[id(driver)] = uses
+        if broken or uses >= MAX_USES_PER_INSTANCE:
+            self._retire(driver)
+            try:
+                driver = make_driver()
+            except Exception:
+                self._q.put(_NEEDS_DRIVER)
+                return
+        self._q.put(driver)
+
+    def _retire(self, driver):
+        """Quit a driver that is done for and forget its use count."""
+        self._uses.pop(id(driver), None)
         try: driver.quit()
         except Exception: pass
-        try: gc.collect()
-        except Exception: pass
-    atexit.register(_safe_quit)
-    return driver
+
+    def drain(self):
+        while True:
+            try:
+                item = self._q.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _NEEDS_DRIVER:
+                self._retire(item)
 
 def origin_of(url: str) -> str:
     if url.startswith("http"):
@@ -129,46 +245,70 @@ def grant_geo(driver, url: str, lat: float=None, lng: float=None):
     except Exception:
         pass
 
-ETA_PAT = re.compile(r"\b(\d+)\s*(?:–|-|to)?\s*(\d+)?\s*mins?\b", re.I)
-
-def parse_eta_from_text(texts: List[str]) -> str:
-    hits = []
-    for t in texts:
-        for m in ETA_PAT.finditer(t):
-            hits.append(m.group(0).strip())
-    if not hits:
-        joined = " | ".join(texts)
-        for m in ETA_PAT.finditer(joined):
-            hits.append(m.group(0).strip())
-    if not hits:
-        return ""
-    hits.sort(key=len)
-    return hits[0]
+# google-re2 is a DFA engine: guaranteed O(n), no backtracking on pathological
+# page text. Optional — the stdlib engine handles the same pattern.
+try:
+    import re2 as _re_impl
+except ImportError:
+    _re_impl = re
+
+# The individual patterns, kept as module constants so each exists in exactly
+# one place, then combined into one alternation: a single pass over the page
+# text, with the winning branch named by m.lastgroup.
+ETA_PAT      = r"\b\d+\s*(?:–|-|to)?\s*\d*\s*mins?\b"
+CLOSED_PAT   = r"temporarily closed|closed"
+NOTACC_PAT   = r"currently not accepting|not accepting"
+OPENS_AT_PAT = r"opens?\s+at\s+(?P<opens>[0-9:\sapm\.]+)"
+
+COMBINED_RE = _re_impl.compile(
+    rf"(?P<eta>{ETA_PAT})"
+    rf"|(?P<closed>{CLOSED_PAT})"
+    rf"|(?P<notacc>{NOTACC_PAT})"
+    rf"|{OPENS_AT_PAT}",
+    _re_impl.IGNORECASE,
+)
+
+def scan_page_text(text: str) -> Tuple[str, str]:
+    """One regex pass over the page text. Returns (status, eta)."""
+    status = None
+    etas = []
+    for m in COMBINED_RE.finditer(text):
+        g = m.lastgroup
+        if g == "eta":
+            etas.append(m.group().strip())
+        elif status is None:
+            if g == "closed":
+                status = "Closed"
+            elif g == "notacc":
+                status = "Not accepting orders"
+            else:
+                status = f"Opens at {m.group('opens').strip()}"
+    return status or "Available", (min(etas, key=len) if etas else "")
 
 def extract_texts(driver, locs: List[Tuple[str,str]], max_elems=60) -> List[str]:
-    out, seen = [], set()
+    # A dict keeps insertion order and dedups in one structure — no parallel
+    # list+set with a membership branch per element.
+    d = {}
     for by, value in locs:
         b = By.XPATH if by == "xpath" else By.CSS_SELECTOR
         try:
+            # .text is a round-trip too and can go stale mid-render; keep it
+            # under the same guard so one bad locator doesn't sink the rest.
             elems = driver.find_elements(b, value)
-            for e in elems[:max_elems]:
-                t = e.text.strip()
-                if t and t not in seen:
-                    out.append(t); seen.add(t)
+            d.update((t, None) for t in (e.text.strip() for e in elems[:max_elems]) if t)
         except WebDriverException:
             continue
-    return out
-
-def infer_status(texts: List[str]) -> str:
-    j = " | ".join(t.lower() for t in texts)
-    if "temporarily closed" in j or "closed" in j:
-        return "Closed"
-    if "not accepting" in j or "currently not accepting" in j:
-        return "Not accepting orders"
-    m = re.search(r"opens?\s+at\s+([0-9:\sapm\.]+)", j)
-    if m:
-        return f"Opens at {m.group(1).strip()}"
-    return "Available"
+    return list(d)
+
+def count_sold_out(text: str) -> int:
+    low = text.lower()
+    return low.count("sold out") + low.count("unavailable")
+
+# Page-readiness locators: anything that signals the SPA has rendered store content.
+# Waiting on these instead of a fixed sleep returns as soon as the page is usable.
+SW_READY    = (By.CSS_SELECTOR, "[class*='restaurant'], [class*='menu'], [class*='status']")
+ZO_READY    = (By.CSS_SELECTOR, "[class*='restaurant'], [class*='res-'], [class*='menu']")
+_MINS_READY = (By.XPATH, "//*[contains(translate(., 'MINS', 'mins'), 'mins')]")
 
 # Swiggy locators
 SW_STATUS_LOCS = [
@@ -202,43 +342,213 @@ ZO_ETA_LOCS = [
     ("css",   "[class*='minute'], [class*='mins'], [class*='time'], [class*='eta']"),
 ]
 
-@retry(stop=stop_after_attempt(2), wait=wait_fixed(2))
-def scrape_store(aggregator: str, url: str, lat: float=None, lng: float=None) -> str:
-    """Create a short-lived driver per store (safe for parallelism). Return compact status string."""
+def page_text(driver, aggregator: str) -> str:
+    """Whole-page text in one CDP round-trip; the per-locator XPath scans are fallback only."""
+    try:
+        full_text = driver.execute_script("return document.body.innerText || ''")
+    except WebDriverException:
+        full_text = ""
+    if full_text.strip():
+        return full_text
+    if aggregator.lower().startswith("swiggy"):
+        texts = (extract_texts(driver, SW_STATUS_LOCS)
+                 + extract_texts(driver, SW_ETA_LOCS)
+                 + extract_texts(driver, SW_SOLDOUT_LOCS, max_elems=300))
+    else:
+        texts = extract_texts(driver, ZO_STATUS_LOCS) + extract_texts(driver, ZO_ETA_LOCS)
+    return " | ".join(texts)
+
+# ==================== ASYNC ENGINE (Playwright, optional) ====================
+def _pw_selector(by: str, value: str) -> str:
+    return f"xpath={value}" if by == "xpath" else value
+
+async def _pw_texts(page, locs: List[Tuple[str,str]], max_elems=60) -> List[str]:
+    out = {}
+    for by, value in locs:
+        try:
+            texts = await page.locator(_pw_selector(by, value)).all_inner_texts()
+        except PlaywrightError:
+            continue
+        for t in texts[:max_elems]:
+            t = t.strip()
+            if t:
+                out[t] = None
+    return list(out)
+
+async def _pw_page_text(page, aggregator: str) -> str:
+    """Playwright twin of page_text: one evaluate call, locators as fallback."""
+    try:
+        full_text = await page.evaluate("document.body.innerText || ''")
+    except PlaywrightError:
+        full_text = ""
+    if full_text.strip():
+        return full_text
+    if aggregator.lower().startswith("swiggy"):
+        texts = (await _pw_texts(page, SW_STATUS_LOCS)
+                 + await _pw_texts(page, SW_ETA_LOCS)
+                 + await _pw_texts(page, SW_SOLDOUT_LOCS, max_elems=300))
+    else:
+        texts = await _pw_texts(page, ZO_STATUS_LOCS) + await _pw_texts(page, ZO_ETA_LOCS)
+    return " | ".join(texts)
+
+# Context-level mirror of BLOCKED_URLS: the scraper only reads text.
+_PW_BLOCKED_TYPES = frozenset(["image", "font", "media"])
+_PW_BLOCKED_HOSTS = ("googletagmanager", "google-analytics", "facebook.net")
+
+async def _pw_block_route(route):
+    req = route.request
+    if req.resource_type in _PW_BLOCKED_TYPES or any(h in req.url for h in _PW_BLOCKED_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def scrape_store_async(browser, aggregator: str, url: str, lat: float=None, lng: float=None) -> str:
+    """Async twin of scrape_store: a fresh BrowserContext (~50 ms) instead of a fresh browser."""
     if not url.startswith("http"):
         url = "https://" + url.lstrip("/")
 
-    driver = make_driver()
+    ctx_kw = {}
+    if lat is not None and lng is not None:
+        ctx_kw = {
+            "geolocation": {"latitude": float(lat), "longitude": float(lng), "accuracy": 50},
+            "permissions": ["geolocation"],
+        }
+    ctx = await browser.new_context(**ctx_kw)
     try:
-        grant_geo(driver, url, lat, lng)
-        driver.get(url)
-        time.sleep(AFTER_LOAD_WAIT)
+        await ctx.route("**/*", _pw_block_route)
+        page = await ctx.new_page()
+        for attempt in range(2):
+            try:
+                await page.goto(url, timeout=PAGELOAD_TIMEOUT * 1000, wait_until="domcontentloaded")
+                break
+            except PlaywrightError:
+                if attempt == 1:
+                    raise
+
+        # Same readiness wait as the selenium path: proceed as soon as store
+        # content (or any 'mins' text) renders, with AFTER_LOAD_WAIT as the cap.
+        ready_css = (SW_READY if aggregator.lower().startswith("swiggy") else ZO_READY)[1]
+        ready = page.locator(ready_css).or_(page.locator(f"xpath={_MINS_READY[1]}")).first
         try:
-            WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        except TimeoutException:
-            pass
+            await ready.wait_for(state="attached", timeout=AFTER_LOAD_WAIT * 1000)
+        except PlaywrightError:
+            pass  # scrape whatever did render
+
+        if BETWEEN_STORES_S > 0:
+            await asyncio.sleep(BETWEEN_STORES_S)
 
+        full_text = await _pw_page_text(page, aggregator)
+        status, eta = scan_page_text(full_text)
+        compact   = status if not eta else f"{status} | {eta}"
         if aggregator.lower().startswith("swiggy"):
-            status_texts = extract_texts(driver, SW_STATUS_LOCS)
-            eta_texts    = extract_texts(driver, SW_ETA_LOCS)
-            sold_out     = len(extract_texts(driver, SW_SOLDOUT_LOCS, max_elems=300))
-            status       = infer_status(status_texts)
-            eta          = parse_eta_from_text(eta_texts)
-            compact      = status if not eta else f"{status} | {eta}"
+            sold_out = count_sold_out(full_text)
             if sold_out:
                 compact += f" | SO:{sold_out}"
-            return compact
+        return compact
 
-        # Zomato
-        status_texts = extract_texts(driver, ZO_STATUS_LOCS)
-        eta_texts    = extract_texts(driver, ZO_ETA_LOCS)
-        status       = infer_status(status_texts)
-        eta          = parse_eta_from_text(eta_texts)
-        return status if not eta else f"{status} | {eta}"
+    finally:
+        await ctx.close()
+
+class PlaywrightEngine:
+    """One Chromium on a dedicated event-loop thread, shared by all tab threads.
+
+    Tab threads submit jobs with run_coroutine_threadsafe, so a single
+    Semaphore(MAX_WORKERS) caps concurrent pages process-wide — the async
+    counterpart of what BrowserPool does for the selenium engine.
+    """
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="pw-engine", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    async def _start(self):
+        self._sem = asyncio.Semaphore(MAX_WORKERS)
+        self._pw = await async_playwright().start()
+        self._browser = await self._pw.chromium.launch(headless=HEADLESS)
+
+    async def _one(self, aggregator, url, lat, lng):
+        async with self._sem:
+            return await scrape_store_async(self._browser, aggregator, url, lat, lng)
+
+    def scrape_all(self, scrape_jobs) -> Dict[int, str]:
+        """scrape_jobs: list of (row, (agg, link, lat, lng)). Returns {row: compact}."""
+        futs = {
+            r: asyncio.run_coroutine_threadsafe(self._one(*payload), self._loop)
+            for r, payload in scrape_jobs
+        }
+        results: Dict[int, str] = {}
+        for r, fut in futs.items():
+            try:
+                results[r] = fut.result()
+            except Exception as e:
+                results[r] = f"Error: {type(e).__name__}"
+        return results
+
+    def close(self):
+        async def _stop():
+            try:
+                await self._browser.close()
+            finally:
+                await self._pw.stop()
+        try:
+            asyncio.run_coroutine_threadsafe(_stop(), self._loop).result(timeout=30)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+# ==================== SELENIUM ENGINE (default) ====================
+def scrape_store(pool: "BrowserPool", aggregator: str, url: str, lat: float=None, lng: float=None) -> str:
+    """Scrape one store on a pooled driver (safe for parallelism). Return compact status string.
+
+    A flaky page load is retried once on the same driver — retrying the whole
+    function used to spin up a second Chrome, doubling worst-case latency.
+    """
+    if not url.startswith("http"):
+        url = "https://" + url.lstrip("/")
+
+    driver = pool.get()
+    broken = False
+    try:
+        grant_geo(driver, url, lat, lng)
+        ready = SW_READY if aggregator.lower().startswith("swiggy") else ZO_READY
+        for attempt in range(2):
+            try:
+                driver.get(url)
+                try:
+                    WebDriverWait(driver, AFTER_LOAD_WAIT).until(EC.any_of(
+                        EC.presence_of_element_located(ready),
+                        EC.presence_of_element_located(_MINS_READY),
+                    ))
+                except TimeoutException:
+                    pass  # scrape whatever did render
+                break
+            except WebDriverException:
+                if attempt == 1:
+                    raise
+                try: driver.execute_script("window.stop()")
+                except WebDriverException: pass
+
+        # Politeness delay lives in the worker, overlapping across threads —
+        # on the collector it serialized every result by BETWEEN_STORES_S.
+        if BETWEEN_STORES_S > 0:
+            time.sleep(BETWEEN_STORES_S)
+
+        full_text = page_text(driver, aggregator)
+        status, eta = scan_page_text(full_text)
+        compact   = status if not eta else f"{status} | {eta}"
+        if aggregator.lower().startswith("swiggy"):
+            sold_out = count_sold_out(full_text)
+            if sold_out:
+                compact += f" | SO:{sold_out}"
+        return compact
 
+    except WebDriverException:
+        broken = True
+        raise
     finally:
-        try: driver.quit()
-        except Exception: pass
+        pool.put_back(driver, broken=broken)
 
 def to_float(x: Any):
     try:
@@ -248,12 +558,15 @@ def to_float(x: Any):
         return None
 
 # ==================== PER-TAB PROCESSING ====================
-def process_one_tab(sh, tab_name: str) -> None:
+def process_one_tab(sh, tab_name: str, browser_pool: "BrowserPool" = None,
+                    pw_engine: "PlaywrightEngine" = None) -> Tuple[str, List[dict]]:
+    """Scrape one tab and return (tab_name, updates); the caller batches all
+    tabs' updates into a single Sheets write."""
     ws = sh.worksheet(tab_name)
     all_vals = ws.get_all_values()
     if not all_vals:
         print(f"[{tab_name}] Empty sheet; skipping.")
-        return
+        return tab_name, []
 
     header_row, cols = find_header_row_and_columns(all_vals)
     col_brand    = cols["brand"]
@@ -265,21 +578,26 @@ def process_one_tab(sh, tab_name: str) -> None:
 
     # Our horizontal log begins at the first column right of Longitude
     start_log_col = col_lng + 1
-    log_col = first_empty_log_column(ws, start_log_col)
-
-    # Stamp Date (row 1) + Time (row 2)
-    ws.update_cell(1, log_col, now_date_str())
-    ws.update_cell(2, log_col, now_time_str())
+    log_col = first_empty_log_column(all_vals, start_log_col)
+
+    # Transpose once into per-column tuples (AoS -> SoA): the padding and
+    # zip(*...) run in C, replacing a per-row closure that bounds-checked and
+    # indexed four times per row.
+    ncols  = max(len(row) for row in all_vals)
+    padded = [row + [""] * (ncols - len(row)) for row in all_vals]
+    cols_arr = list(zip(*padded))
+    agg_col  = cols_arr[col_agg - 1]
+    link_col = cols_arr[col_link - 1]
+    lat_col  = cols_arr[col_lat - 1]
+    lng_col  = cols_arr[col_lng - 1]
 
     # Build jobs from row 3 onwards (as you requested)
     jobs = []
     for r in range(max(3, header_row + 1), len(all_vals) + 1):
-        row_vals = all_vals[r-1]
-        def getv(ci): return row_vals[ci-1] if ci-1 < len(row_vals) else ""
-        agg   = getv(col_agg).strip()
-        link  = getv(col_link).strip()
-        lat   = to_float(getv(col_lat))
-        lng   = to_float(getv(col_lng))
+        agg   = agg_col[r-1].strip()
+        link  = link_col[r-1].strip()
+        lat   = to_float(lat_col[r-1])
+        lng   = to_float(lng_col[r-1])
         if not agg or not link:
             jobs.append((r, "Missing link/aggregator"))
         else:
@@ -287,37 +605,75 @@ def process_one_tab(sh, tab_name: str) -> None:
 
     # Run scraping in parallel for this tab
     results: Dict[int, str] = {}
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
-        future_map = {}
-        for r, payload in jobs:
-            if isinstance(payload, tuple):
-                agg, link, lat, lng = payload
-                fut = pool.submit(scrape_store, agg, link, lat, lng)
-                future_map[fut] = r
-            else:
-                # Already has a message (missing data)
-                results[r] = payload
-
-        for fut in as_completed(future_map):
-            r = future_map[fut]
+    scrape_jobs = []
+    for r, payload in jobs:
+        if isinstance(payload, tuple):
+            scrape_jobs.append((r, payload))
+        else:
+            # Already has a message (missing data)
+            results[r] = payload
+
+    if SCRAPER_ENGINE == "playwright" and async_playwright is not None:
+        if scrape_jobs:
+            # The engine is normally passed in from main and shared across tabs
+            own_engine = pw_engine is None
+            if own_engine:
+                pw_engine = PlaywrightEngine()
             try:
-                compact = fut.result()
-            except Exception as e:
-                compact = f"Error: {type(e).__name__}"
-            results[r] = compact
-            time.sleep(BETWEEN_STORES_S)
-
-    # Batch update this tab’s column
-    updates = []
+                results.update(pw_engine.scrape_all(scrape_jobs))
+            finally:
+                if own_engine:
+                    pw_engine.close()
+    else:
+        # Default: selenium threads on a shared pool of pre-warmed drivers.
+        # The pool is normally passed in from main and shared across tabs.
+        own_pool = browser_pool is None
+        if own_pool and scrape_jobs:
+            browser_pool = BrowserPool(min(MAX_WORKERS, len(scrape_jobs)))
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+                future_map = {}
+                for r, payload in scrape_jobs:
+                    agg, link, lat, lng = payload
+                    fut = pool.submit(scrape_store, browser_pool, agg, link, lat, lng)
+                    future_map[fut] = r
+
+                for fut in as_completed(future_map):
+                    r = future_map[fut]
+                    try:
+                        compact = fut.result()
+                    except Exception as e:
+                        compact = f"Error: {type(e).__name__}"
+                    results[r] = compact
+        finally:
+            if own_pool and browser_pool:
+                browser_pool.drain()
+
+    # This tab’s column of writes; the Date (row 1) + Time (row 2) stamp rides
+    # along. The actual write happens once for all tabs in main.
+    updates = [
+        {"range": gspread.utils.rowcol_to_a1(1, log_col), "values": [[now_date_str()]]},
+        {"range": gspread.utils.rowcol_to_a1(2, log_col), "values": [[now_time_str()]]},
+    ]
     for r, v in sorted(results.items()):
         a1 = gspread.utils.rowcol_to_a1(r, log_col)
         updates.append({"range": a1, "values": [[v]]})
-    if updates:
-        ws.batch_update(updates, value_input_option="USER_ENTERED")
 
-    print(f"[{tab_name}] Logged {len(results)} rows to column {log_col}.")
+    print(f"[{tab_name}] Collected {len(results)} rows for column {log_col}.")
+    return tab_name, updates
 
 # ==================== MAIN ====================
+def _safe_process(sh, tab_name: str, browser_pool: "BrowserPool",
+                  pw_engine: "PlaywrightEngine") -> Tuple[str, List[dict]]:
+    try:
+        return process_one_tab(sh, tab_name, browser_pool, pw_engine)
+    except (Exception, SystemExit) as e:
+        # SystemExit too: find_header_row_and_columns raises it for tabs
+        # without the expected header row (notes tabs etc.), and one bad tab
+        # must not abort the run before the batched write.
+        print(f"[{tab_name}] Failed: {type(e).__name__}: {e}")
+        return tab_name, []
+
 def main():
     if not SHEET_ID:
         raise SystemExit("Set SHEET_ID in .env")
@@ -325,13 +681,36 @@ def main():
     tabs = get_or_all_tabs(sh)
     print("Tabs to process:", tabs)
 
-    # Process tabs sequentially, but each tab scrapes its rows in parallel.
-    # (If you want FULL parallel tabs too, you can wrap this loop with another ThreadPoolExecutor.)
-    for tab in tabs:
-        try:
-            process_one_tab(sh, tab)
-        except Exception as e:
-            print(f"[{tab}] Failed: {type(e).__name__}: {e}")
+    # Tabs run in parallel too; they all draw from one shared driver pool (or
+    # one shared Chromium for the playwright engine), so total browser count
+    # and page concurrency stay capped at MAX_WORKERS.
+    browser_pool = None
+    pw_engine = None
+    if tabs:
+        if SCRAPER_ENGINE == "playwright" and async_playwright is not None:
+            pw_engine = PlaywrightEngine()
+        else:
+            browser_pool = BrowserPool(MAX_WORKERS)
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(tabs), MAX_TAB_WORKERS) or 1) as tp:
+            per_tab = list(tp.map(lambda t: _safe_process(sh, t, browser_pool, pw_engine), tabs))
+    finally:
+        if browser_pool:
+            browser_pool.drain()
+        if pw_engine:
+            pw_engine.close()
+
+    # One write for the whole workbook: every tab's updates in a single
+    # spreadsheets.values.batchUpdate request.
+    # A1 tab qualification doubles embedded single quotes: 'Joe''s Cafe'!B1
+    data = [
+        {"range": "'{}'!{}".format(title.replace("'", "''"), u["range"]), "values": u["values"]}
+        for title, updates in per_tab
+        for u in updates
+    ]
+    if data:
+        sh.values_batch_update(body={"valueInputOption": "USER_ENTERED", "data": data})
+        print(f"Wrote {len(data)} cells across {sum(1 for _, ups in per_tab if ups)} tabs in one batch.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,38 +1,47 @@
-import os, sys, time, subprocess, random, datetime
+import os, io, sys, time, random, datetime, contextlib, atexit, threading
 from pathlib import Path
 
+import monitor_parallel_tabs as tracker
+from google.auth.exceptions import RefreshError
+
+try:
+    import fcntl                      # POSIX
+except ImportError:
+    fcntl = None
+    import msvcrt                     # Windows
+
 # === Config ===
-SCRIPT = "monitor_parallel_tabs.py"   # the tracker you already have
 INTERVAL_MIN = 15                     # run every 15 minutes
 JITTER_SEC = (5, 20)                  # add 5-20 sec random delay
 LOCKFILE = Path("run_every_15m.lock")
 LOGDIR = Path("logs")
-PYTHON = sys.executable               # use current venv's python
 
 LOGDIR.mkdir(exist_ok=True)
 
+# Kernel advisory lock: the OS releases it automatically when the process
+# dies, so there is no stale-lockfile state and no mtime heuristics.
+_LOCK_FD = None
+
 def acquire_lock():
-    # naive cross-platform lock via O_EXCL
+    global _LOCK_FD
+    if _LOCK_FD is None:
+        _LOCK_FD = os.open(LOCKFILE, os.O_CREAT | os.O_WRONLY)
     try:
-        fd = os.open(LOCKFILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-        os.close(fd)
+        if fcntl is not None:
+            fcntl.flock(_LOCK_FD, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(_LOCK_FD, msvcrt.LK_NBLCK, 1)
         return True
-    except FileExistsError:
-        # If lock is stale (older than 2 hours), remove it
-        try:
-            mtime = LOCKFILE.stat().st_mtime
-            if (time.time() - mtime) > 2 * 3600:
-                LOCKFILE.unlink(missing_ok=True)
-                fd = os.open(LOCKFILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-                os.close(fd)
-                return True
-        except FileNotFoundError:
-            return acquire_lock()
+    except OSError:
         return False
 
 def release_lock():
     try:
-        LOCKFILE.unlink(missing_ok=True)
+        if fcntl is not None:
+            fcntl.flock(_LOCK_FD, fcntl.LOCK_UN)
+        else:
+            os.lseek(_LOCK_FD, 0, os.SEEK_SET)
+            msvcrt.locking(_LOCK_FD, msvcrt.LK_UNLCK, 1)
     except Exception:
         pass
 
@@ -40,11 +49,56 @@ def log_path():
     ts = datetime.datetime.now().strftime("%Y%m%d")
     return LOGDIR / f"tracker_{ts}.log"
 
+# One handle per day, line-buffered: each write flushes on newline without
+# re-opening the file for every log line.
+_LOG_FH = None
+_LOG_DATE = None
+
+def _close_log():
+    if _LOG_FH is not None:
+        try: _LOG_FH.close()
+        except Exception: pass
+
+atexit.register(_close_log)
+
 def log_write(msg: str):
-    p = log_path()
-    with open(p, "a", encoding="utf-8") as f:
-        f.write(msg.rstrip() + "\n")
-    print(msg, flush=True)
+    global _LOG_FH, _LOG_DATE
+    today = datetime.date.today()
+    if _LOG_FH is None or _LOG_DATE != today:
+        _close_log()
+        _LOG_FH = open(log_path(), "a", encoding="utf-8", buffering=1)
+        _LOG_DATE = today
+    _LOG_FH.write(msg.rstrip() + "\n")
+    # Write to the real console: during a tracker run sys.stdout is redirected
+    # into a _LineLogger, and printing there would recurse.
+    print(msg, flush=True, file=sys.__stdout__)
+
+class _LineLogger(io.TextIOBase):
+    """stdout/stderr sink that forwards complete lines to log_write as they
+    arrive, instead of buffering a whole cycle's output in memory.
+
+    The tracker prints from parallel tab workers, so the buffer read-modify-
+    write is guarded by a lock (the subprocess pipe this replaced serialized
+    writes at the OS level).
+    """
+    def __init__(self):
+        self._buf = ""
+        self._lock = threading.Lock()
+
+    def write(self, s: str) -> int:
+        with self._lock:
+            self._buf += s
+            while "\n" in self._buf:
+                line, self._buf = self._buf.split("\n", 1)
+                if line.strip():
+                    log_write(line)
+        return len(s)
+
+    def flush(self):
+        with self._lock:
+            if self._buf.strip():
+                log_write(self._buf)
+            self._buf = ""
 
 def sleep_until_next_slot():
     now = datetime.datetime.now()
@@ -64,17 +118,26 @@ def sleep_until_next_slot():
         time.sleep(seconds)
 
 def run_once():
+    # In-process call: no interpreter start, no re-imports, and the tracker's
+    # cached gspread client survives between cycles.
     ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_write(f"[{ts}] Starting tracker run")
+    sink = _LineLogger()
     try:
-        cp = subprocess.run([PYTHON, SCRIPT], capture_output=True, text=True)
-        if cp.stdout:
-            log_write(cp.stdout)
-        if cp.stderr:
-            log_write("STDERR:\n" + cp.stderr)
-        log_write(f"[{ts}] Run finished with exit code {cp.returncode}\n")
-    except Exception as e:
+        with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+            try:
+                tracker.main()
+            except RefreshError:
+                # Token expired mid-life; re-auth once and retry the cycle
+                tracker.open_client_and_sheet(force_new=True)
+                tracker.main()
+        rc = 0
+    except (Exception, SystemExit) as e:
         log_write(f"Exception while running: {type(e).__name__}: {e}\n")
+        rc = 1
+    finally:
+        sink.flush()
+    log_write(f"[{ts}] Run finished with exit code {rc}\n")
 
 def main():
     # immediate first run (optional: comment out if you want to wait until next slot first)